@@ -1,10 +1,11 @@
 import asyncio
+import functools
 import json
 import os
 import pwd
 import re
-import shutil
-import subprocess
+import signal
+import tempfile
 import time
 from pathlib import Path
 
@@ -13,48 +14,499 @@ from pathlib import Path
 # and add the `decky-loader/plugin/imports` path to `python.analysis.extraPaths` in `.vscode/settings.json`
 import decky
 
+# orjson works on bytes directly and is much faster, but it isn't bundled with
+# decky-loader, so fall back to the stdlib when it's missing
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode()
+
 # Initialize decky-loader settings manager
 from settings import SettingsManager
 settingsDir = os.environ.get("DECKY_PLUGIN_SETTINGS_DIR", "/tmp")
 settings = SettingsManager(name="settings", settings_directory=settingsDir)
 settings.read()
 
+# VDF keys and patterns, built once at import instead of on every call
+
+# Owner fields of an appmanifest_<appid>.acf, keyed by the name returned to the frontend
+_MANIFEST_OWNER_KEYS = {
+    'last_owner': b'"LastOwner"',
+    'installed_by': b'"InstalledBy"',
+}
+# Opening of the top-level users block in loginusers.vdf
+_RE_USERS_BLOCK = re.compile(rb'"users"\s*\{', re.IGNORECASE)
+# A set mostrecent flag, only ever searched within a single user block
+_RE_MOSTRECENT_ONE = re.compile(rb'"mostrecent"\s+"1"', re.IGNORECASE)
+
+# One token per match: a quoted string, a brace, a // comment or a bare word
+_RE_VDF_TOKEN = re.compile(rb'"((?:[^"\\]|\\.)*)"|([{}])|//[^\n]*|([^\s{}"]+)')
+# Backslash escapes Steam writes inside quoted strings; anything else is kept as is
+_RE_VDF_ESCAPE = re.compile(rb'\\(.)', re.DOTALL)
+_VDF_ESCAPES = {b'n': b'\n', b't': b'\t', b'\\': b'\\', b'"': b'"'}
+
+
+def _unescape_vdf(match) -> bytes:
+    """re.sub callback resolving one _RE_VDF_ESCAPE match."""
+    return _VDF_ESCAPES.get(match.group(1), match.group(0))
+
+
+def _parse_vdf(text: bytes) -> dict:
+    """Parse a text VDF document into nested dicts in a single pass.
+
+    Only the individual tokens are decoded, never the whole file, and
+    backslash escapes in quoted strings are resolved. Keys are lower-cased
+    since Steam treats them case-insensitively.
+    """
+    root = {}
+    stack = [root]
+    key = None
+    for match in _RE_VDF_TOKEN.finditer(text):
+        quoted, brace, bare = match.groups()
+        if brace == b'{':
+            node = {}
+            if key is not None:
+                stack[-1][key] = node
+            stack.append(node)
+            key = None
+        elif brace == b'}':
+            if len(stack) > 1:
+                stack.pop()
+            key = None
+        else:
+            if quoted is not None:
+                token = quoted
+                # Escapes are rare, so only run the substitution when there is one
+                if b'\\' in token:
+                    token = _RE_VDF_ESCAPE.sub(_unescape_vdf, token)
+            elif bare is not None:
+                token = bare
+            else:
+                continue  # comment
+            token = token.decode('utf-8', errors='replace')
+            if key is None:
+                key = token.lower()
+            else:
+                stack[-1][key] = token
+                key = None
+    return root
+
+
+def _user_entry(steamid: str, user_data: dict):
+    """Build the frontend user dict from a parsed loginusers.vdf block, None if it has no account."""
+    account_name = user_data.get('accountname')
+    if not account_name:
+        return None
+    return {
+        'steamid': steamid,
+        'accountName': account_name,
+        'personaName': user_data.get('personaname') or account_name,
+        'mostRecent': user_data.get('mostrecent') == "1",
+        'timestamp': int(user_data.get('timestamp') or 0)
+    }
+
+
+def _rewrite_vdf(text: bytes, replace) -> bytes:
+    """Rewrite values of a text VDF document in the same single tokenizer pass as _parse_vdf.
+
+    `replace(path, key, value)` is called for every key/value pair, with `path`
+    the tuple of lower-cased block keys leading to it. Returning bytes splices
+    them in as the new value; everything else, formatting included, is kept
+    byte for byte. When nothing was replaced `text` itself is returned, so the
+    callers' no-op check is an identity comparison rather than a full compare.
+    """
+    out = []
+    last = 0
+    path = []
+    key = None
+    for match in _RE_VDF_TOKEN.finditer(text):
+        quoted, brace, bare = match.groups()
+        if brace == b'{':
+            path.append(key)
+            key = None
+        elif brace == b'}':
+            if path:
+                path.pop()
+            key = None
+        else:
+            token = quoted if quoted is not None else bare
+            if token is None:
+                continue  # comment
+            if key is None:
+                key = token.lower()
+                continue
+            new_value = replace(tuple(path), key, token)
+            if new_value is not None and new_value != token:
+                out.append(text[last:match.start()])
+                out.append(b'"' + new_value + b'"')
+                last = match.end()
+            key = None
+    if not out:
+        return text
+    out.append(text[last:])
+    return b''.join(out)
+
+
+@functools.lru_cache(maxsize=64)
+def _app_block_re(appids: tuple):
+    """Compiled bytes pattern locating the opening brace of any of `appids`' localconfig.vdf blocks.
+
+    All appids go into one alternation so a batch lookup is still a single
+    pass over the file.
+    """
+    alternatives = b'|'.join(re.escape(appid.encode()) for appid in appids)
+    return re.compile(rb'"(' + alternatives + rb')"\s*\{')
+
+
+def _find_block_end(buf: bytes, start: int) -> int:
+    """Return the index of the brace closing the block opened at `start`, or -1.
+
+    Jumps between braces and quotes with bytes.find so the scan runs in C
+    rather than one Python iteration per character. Braces inside quoted
+    strings (e.g. a persona name) don't count.
+    """
+    find = buf.find
+    depth = 0
+    next_open = start
+    next_close = find(b'}', start)
+    next_quote = find(b'"', start)
+    while next_close != -1:
+        if next_quote != -1 and next_quote < next_close and (next_open == -1 or next_quote < next_open):
+            end = find(b'"', next_quote + 1)
+            while end != -1:
+                # The quote is escaped if an odd number of backslashes precede
+                # it, so "C:\\" still ends the string. Only checked at quotes,
+                # never per byte
+                escape = end
+                while buf[escape - 1] == 0x5c:
+                    escape -= 1
+                if (end - escape) % 2 == 0:
+                    break
+                end = find(b'"', end + 1)
+            if end == -1:
+                return -1
+            # Anything found inside the string was text, look again after it
+            if next_open != -1 and next_open < end:
+                next_open = find(b'{', end + 1)
+            if next_close < end:
+                next_close = find(b'}', end + 1)
+            next_quote = find(b'"', end + 1)
+        elif next_open != -1 and next_open < next_close:
+            depth += 1
+            next_open = find(b'{', next_open + 1)
+        else:
+            depth -= 1
+            if depth == 0:
+                return next_close
+            next_close = find(b'}', next_close + 1)
+    return -1
+
+
+def _find_flagged_users(content: bytes) -> list:
+    """(steamid, parsed block) of every loginusers.vdf user with mostrecent set, in file order.
+
+    Walks the users block one user at a time with _find_block_end, so a
+    truncated file just ends the walk instead of sending a regex scanning
+    across blocks. Only blocks that mention the flag get parsed.
+    """
+    flagged = []
+    match = _RE_USERS_BLOCK.search(content)
+    if not match:
+        return flagged
+    pos = match.end()
+    while True:
+        key_start = content.find(b'"', pos)
+        users_end = content.find(b'}', pos)
+        if key_start == -1 or (users_end != -1 and users_end < key_start):
+            return flagged
+        key_end = content.find(b'"', key_start + 1)
+        start_brace_idx = content.find(b'{', key_end + 1) if key_end != -1 else -1
+        if start_brace_idx == -1:
+            return flagged
+        end_brace_idx = _find_block_end(content, start_brace_idx)
+        if end_brace_idx == -1:
+            return flagged
+        if _RE_MOSTRECENT_ONE.search(content, start_brace_idx, end_brace_idx):
+            user_data = _parse_vdf(content[start_brace_idx + 1:end_brace_idx])
+            steamid = content[key_start + 1:key_end].decode()
+            if user_data.get('mostrecent') == "1" and steamid.isdigit():
+                flagged.append((steamid, user_data))
+        pos = end_brace_idx + 1
+
+
+def _stat_key(path: str) -> tuple:
+    """(st_mtime_ns, st_size) of `path`, used to tell whether a cached parse is still valid."""
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_file(path: str) -> bytes:
+    """Read a whole file as bytes, meant to be run through asyncio.to_thread."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _atomic_write(path: str, data: bytes):
+    """Replace a Steam file's contents with `data`, meant to be run through asyncio.to_thread.
+
+    The data goes to a sibling temp file owned by the Steam user which is then
+    renamed over `path`, so Steam never sees a half-written file.
+    """
+    path = os.path.realpath(path)
+    mode = os.stat(path).st_mode & 0o7777
+    f = tempfile.NamedTemporaryFile(dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.", delete=False)
+    try:
+        with f:
+            f.write(data)
+            # Set mode and owner on the open descriptor, no path lookups needed
+            try:
+                os.fchmod(f.fileno(), mode)
+            except OSError as e:
+                decky.logger.warn(f"Failed to chmod {os.path.basename(path)}: {e}")
+            try:
+                os.fchown(f.fileno(), _STEAM_UID, _STEAM_GID)
+            except OSError as e:
+                decky.logger.warn(f"Failed to chown {os.path.basename(path)}: {e}")
+            # Make sure the data is on disk before the rename makes it live,
+            # otherwise a power loss can leave an empty file behind
+            f.flush()
+            os.fdatasync(f.fileno())
+        os.replace(f.name, path)
+    except BaseException:
+        # Don't leave the temp file behind in Steam's config directory
+        os.unlink(f.name)
+        raise
 
+
+def _find_app_playtimes(content: bytes, appids: tuple) -> dict:
+    """PlayTime of each of `appids` in localconfig.vdf contents, 0 where absent."""
+    playtimes = dict.fromkeys(appids, 0)
+    start = 0
+    if len(appids) == 1:
+        # Most users never touched most apps, so rule those out with a plain
+        # substring search before starting the regex engine
+        start = content.find(b'"%s"' % appids[0].encode())
+        if start == -1:
+            return playtimes
+    
+    # Find the AppID blocks and only parse those slices of the file. The same
+    # key can also name a block in other sections, so keep looking until one
+    # of them carries a PlayTime
+    pending = set(appids)
+    for match in _app_block_re(appids).finditer(content, start):
+        appid = match.group(1).decode()
+        if appid not in pending:
+            continue
+        start_brace_idx = match.end() - 1
+        end_brace_idx = _find_block_end(content, start_brace_idx)
+        if end_brace_idx == -1:
+            break
+        playtime = _parse_vdf(content[start_brace_idx + 1:end_brace_idx]).get('playtime', '')
+        if playtime.isdigit():
+            playtimes[appid] = int(playtime)
+            pending.discard(appid)
+            if not pending:
+                break
+    return playtimes
+
+
+def _extract_quoted_after(buf: bytes, key: bytes):
+    """Value of the first `key "value"` pair in `buf`, None if it isn't (fully) there.
+
+    Only bytes.find calls, since the key appears once and needs no regex.
+    """
+    start = buf.find(key)
+    if start == -1:
+        return None
+    open_quote = buf.find(b'"', start + len(key))
+    if open_quote == -1:
+        return None
+    close_quote = buf.find(b'"', open_quote + 1)
+    if close_quote == -1:
+        return None
+    return buf[open_quote + 1:close_quote]
+
+
+def _extract_keys(path: str, keys: dict, chunk_size: int = 8192) -> dict:
+    """Search a file chunk by chunk for every quoted key in `keys`, stopping once all were found.
+
+    Returns the value following each key, keyed like `keys`.
+    """
+    found = {}
+    tail = b''
+    with open(path, 'rb') as f:
+        while len(found) < len(keys):
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            # Keep the end of the previous chunk so a key/value split across
+            # two reads still matches
+            buf = tail + chunk
+            for name, key in keys.items():
+                if name not in found:
+                    value = _extract_quoted_after(buf, key)
+                    if value is not None:
+                        found[name] = value.decode()
+            tail = buf[-256:]
+    return found
+
+
+def _list_localconfigs(userdata_path: str) -> list:
+    """List (account ID, localconfig.vdf path) for every user folder under userdata."""
+    candidates = []
+    # DirEntry caches the file type from the directory read, so checking the
+    # name first and then is_dir() costs no extra stat per entry
+    with os.scandir(userdata_path) as it:
+        for entry in it:
+            if not entry.name.isdigit() or not entry.is_dir(follow_symlinks=False):
+                continue
+                
+            local_config = f"{entry.path}/config/localconfig.vdf"
+            if os.path.isfile(local_config):
+                candidates.append((entry.name, local_config))
+    return candidates
+
+
+def _find_manifests(library_folders: list, appids: set) -> dict:
+    """Map each appid in `appids` to its appmanifest, scanning every library folder once."""
+    manifests = {}
+    for lib in library_folders:
+        try:
+            with os.scandir(lib) as it:
+                for entry in it:
+                    name = entry.name
+                    if not name.startswith('appmanifest_') or not name.endswith('.acf'):
+                        continue
+                    appid = name[len('appmanifest_'):-len('.acf')]
+                    if appid in appids and appid not in manifests:
+                        manifests[appid] = entry.path
+        except OSError:
+            continue
+    return manifests
+
+
+def _kill_processes(names: set) -> list:
+    """SIGKILL every process whose name is in `names` and return their PIDs.
+
+    Same matching as `killall -9` (the name in /proc/<pid>/comm), done with
+    a /proc scan instead of forking killall.
+    """
+    killed = []
+    with os.scandir('/proc') as it:
+        for entry in it:
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(f"{entry.path}/comm", 'rb') as f:
+                    if f.read().rstrip(b'\n') not in names:
+                        continue
+                os.kill(int(entry.name), signal.SIGKILL)
+            except (FileNotFoundError, ProcessLookupError):
+                continue  # exited while we were looking
+            killed.append(int(entry.name))
+    return killed
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether `pid` is still running; a zombie waiting to be reaped counts as exited."""
+    try:
+        with open(f"/proc/{pid}/stat", 'rb') as f:
+            stat = f.read()
+    except (FileNotFoundError, ProcessLookupError):
+        return False  # reaped before or while we read it
+    # The state follows the parenthesised command name, which may contain spaces
+    return stat[stat.rindex(b')') + 2:stat.rindex(b')') + 3] != b'Z'
+
+
+def _steam_started_since(pid_file: str, since: float) -> bool:
+    """Whether steam.pid was written after `since` (a time.time() value) by a process that's still alive.
+
+    The file survives the SIGKILL in restart_steam, so its mere existence says
+    nothing; the new client rewrites it on startup.
+    """
+    try:
+        if os.stat(pid_file).st_mtime <= since:
+            return False
+        with open(pid_file, 'rb') as f:
+            pid = int(f.read().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return False
+    return pid > 0 and _process_alive(pid)
+
+
+@functools.cache
 def get_steam_user():
     """Get the username of the user running Steam (typically 'deck' on Steam Deck)."""
     # Try DECKY_USER environment variable first (set by decky-loader)
     decky_user = os.environ.get("DECKY_USER")
     if decky_user:
         return decky_user
-    # Fallback: check who owns the Steam directory
+    # Fallback: check who owns the first Steam directory that exists
     steam_paths = [
-        Path("/home/deck/.steam"),
-        Path.home() / ".steam"
+        "/home/deck/.steam",
+        os.path.expanduser("~/.steam")
     ]
     for steam_path in steam_paths:
-        if steam_path.exists():
-            try:
-                return steam_path.owner()
-            except (KeyError, OSError):
-                pass
+        try:
+            st = os.stat(steam_path)
+        except OSError:
+            continue
+        try:
+            return pwd.getpwuid(st.st_uid).pw_name
+        except KeyError:
+            break
     # Default fallback for Steam Deck
     return "deck"
 
 
 # Get the Steam user dynamically
 STEAM_USER = get_steam_user()
-STEAM_HOME = Path(f"/home/{STEAM_USER}")
+STEAM_HOME = f"/home/{STEAM_USER}"
+
+# SteamID64 of an individual account = account ID (the userdata folder name) + this
+_STEAM_ID64_OFFSET = 76561197960265728
+
+# How many localconfig.vdf files get_local_owners reads at the same time: one
+# per logical CPU (8 on the Deck). The default executor has
+# min(32, cpu_count() + 4) workers, so this leaves 4 of them free for other
+# calls on anything up to 28 logical CPUs (the Deck included)
+_MAX_CONCURRENT_SCANS = os.cpu_count() or 4
+# Shared by every get_local_owners* call, so concurrent frontend requests
+# split the budget instead of each getting a full one
+_SCAN_LIMIT = asyncio.BoundedSemaphore(_MAX_CONCURRENT_SCANS)
+
+# Resolve the Steam user's uid/gid once instead of on every chown
+try:
+    _pw = pwd.getpwnam(STEAM_USER)
+    _STEAM_UID, _STEAM_GID = _pw.pw_uid, _pw.pw_gid
+except KeyError:
+    _STEAM_UID = _STEAM_GID = -1
 
 
 class Plugin:
-    # Paths are determined dynamically based on the Steam user
-    STEAM_CONFIG_PATH = STEAM_HOME / ".local/share/Steam/config"
-    LOGINUSERS_VDF = STEAM_CONFIG_PATH / "loginusers.vdf"
-    USERDATA_PATH = STEAM_HOME / ".local/share/Steam/userdata"
+    # Paths are determined dynamically based on the Steam user. Kept as plain
+    # strings so the hot paths don't build Path objects on every call
+    STEAM_CONFIG_PATH = f"{STEAM_HOME}/.local/share/Steam/config"
+    LOGINUSERS_VDF = f"{STEAM_CONFIG_PATH}/loginusers.vdf"
+    LIBRARYFOLDERS_VDF = f"{STEAM_CONFIG_PATH}/libraryfolders.vdf"
+    STEAMAPPS_PATH = f"{STEAM_HOME}/.local/share/Steam/steamapps"
+    USERDATA_PATH = f"{STEAM_HOME}/.local/share/Steam/userdata"
     # Registry file contains AutoLoginUser - key for account switching!
-    REGISTRY_VDF = STEAM_HOME / ".steam/registry.vdf"
+    REGISTRY_VDF = f"{STEAM_HOME}/.steam/registry.vdf"
     # File to store pending game launch after account switch
     PENDING_LAUNCH_FILE = Path("/tmp/decky_multiuser_pending_launch.json")
+
+    # path -> ((st_mtime_ns, st_size), value derived from the file), reused
+    # while the file's stat is unchanged
+    _file_cache = {}
+    # userdata folder name -> SteamID64 string, filled from loginusers.vdf. The
+    # mapping never changes, so entries stay valid even if the file does
+    _steam64_by_steam3 = {}
     
     # Asyncio-compatible long-running code, executed in a task when the plugin is loaded
     async def _main(self):
@@ -75,11 +527,11 @@ class Plugin:
     async def _check_pending_launch(self):
         """Check if there's a pending game launch after account switch"""
         try:
-            if not self.PENDING_LAUNCH_FILE.exists():
+            try:
+                raw = await asyncio.to_thread(self.PENDING_LAUNCH_FILE.read_bytes)
+            except FileNotFoundError:
                 return
-            
-            with open(self.PENDING_LAUNCH_FILE, 'r') as f:
-                data = json.load(f)
+            data = _json_loads(raw)
             
             self.PENDING_LAUNCH_FILE.unlink()
             
@@ -88,27 +540,46 @@ class Plugin:
                 return
             
             delay = data.get('delay', 3)
+            if not await self._wait_for_steam(data.get('timestamp', 0), max(delay * 2, 10)):
+                decky.logger.warn(f"Steam did not start within {max(delay * 2, 10)}s, launching anyway")
             await asyncio.sleep(delay)
             
-            result = subprocess.run(
-                ['sudo', '-u', STEAM_USER, 'steam', f'steam://rungameid/{appid}'],
-                capture_output=True,
-                text=True,
-                timeout=10
+            proc = await asyncio.create_subprocess_exec(
+                'sudo', '-u', STEAM_USER, 'steam', f'steam://rungameid/{appid}',
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
             )
+            try:
+                _, stderr = await asyncio.wait_for(proc.communicate(), timeout=10)
+            except asyncio.TimeoutError:
+                # A launcher that ends up bootstrapping a client keeps the pipe
+                # open, don't leave it running behind us
+                proc.kill()
+                await proc.wait()
+                decky.logger.warn(f"Game {appid} launch did not return within 10s, killed the launcher")
+                return
+            if proc.returncode != 0:
+                decky.logger.warn(f"Game {appid} launch exited with {proc.returncode}: {stderr.decode(errors='replace').strip()}")
             decky.logger.info(f"Game {appid} launch triggered")
             
         except Exception as e:
             decky.logger.error(f"Error checking pending launch: {e}")
-            if self.PENDING_LAUNCH_FILE.exists():
-                self.PENDING_LAUNCH_FILE.unlink()
+            self.PENDING_LAUNCH_FILE.unlink(missing_ok=True)
 
-    def _save_pending_launch(self, appid: str, delay: int = 0):
+    async def _wait_for_steam(self, since: float, timeout: float):
+        """Wait (at most `timeout` seconds) for a Steam started after `since`, False if none showed up"""
+        pid_file = f"{STEAM_HOME}/.steam/steam.pid"
+        for _ in range(int(timeout / 0.25)):
+            if _steam_started_since(pid_file, since):
+                return True
+            await asyncio.sleep(0.25)
+        return False
+
+    async def _save_pending_launch(self, appid: str, delay: int = 0):
         """Save appid for launch after Steam restart."""
         try:
             data = {'appid': appid, 'delay': delay, 'timestamp': time.time()}
-            with open(self.PENDING_LAUNCH_FILE, 'w') as f:
-                json.dump(data, f)
+            await asyncio.to_thread(self.PENDING_LAUNCH_FILE.write_bytes, _json_dumps(data))
             decky.logger.info(f"Saved pending launch: {appid}")
         except Exception as e:
             decky.logger.error(f"Error saving pending launch: {e}")
@@ -131,244 +602,268 @@ class Plugin:
         """Called by frontend when it loads - checks for pending game launch"""
         asyncio.create_task(self._check_pending_launch())
 
+    def _cached(self, path: str, key: tuple):
+        """Return what was cached for `path` if the file still has stat `key`, else None"""
+        entry = self._file_cache.get(path)
+        if entry and entry[0] == key:
+            return entry[1]
+        return None
+
     async def get_users(self):
         """Get list of all Steam users from loginusers.vdf"""
         try:
-            if not self.LOGINUSERS_VDF.exists():
+            try:
+                key = _stat_key(self.LOGINUSERS_VDF)
+            except FileNotFoundError:
                 decky.logger.error(f"loginusers.vdf not found at {self.LOGINUSERS_VDF}")
                 return []
+            users = self._cached(self.LOGINUSERS_VDF, key)
+            if users is not None:
+                return users
             
-            with open(self.LOGINUSERS_VDF, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = await asyncio.to_thread(_read_file, self.LOGINUSERS_VDF)
             
             users = []
-            user_blocks = list(re.finditer(r'"(\d+)"\s*\{([^}]+)\}', content, re.DOTALL))
-
-            for match in user_blocks:
-                steamid = match.group(1)
-                user_data = match.group(2)
+            for steamid, user_data in _parse_vdf(content).get('users', {}).items():
+                if not isinstance(user_data, dict) or not steamid.isdigit():
+                    continue
                 
-                account_match = re.search(r'"AccountName"\s+"([^"]+)"', user_data, re.IGNORECASE)
-                persona_match = re.search(r'"PersonaName"\s+"([^"]+)"', user_data, re.IGNORECASE)
-                recent_match = re.search(r'"mostrecent"\s+"([^"]+)"', user_data, re.IGNORECASE)
-                timestamp_match = re.search(r'"Timestamp"\s+"([^"]+)"', user_data, re.IGNORECASE)
-                
-                if account_match:
-                    users.append({
-                        'steamid': str(steamid),
-                        'accountName': account_match.group(1),
-                        'personaName': persona_match.group(1) if persona_match else account_match.group(1),
-                        'mostRecent': (recent_match.group(1) == "1") if recent_match else False,
-                        'timestamp': int(timestamp_match.group(1)) if timestamp_match else 0
-                    })
+                user = _user_entry(steamid, user_data)
+                if user:
+                    users.append(user)
             
             users.sort(key=lambda x: x['timestamp'], reverse=True)
+            for user in users:
+                self._steam64_by_steam3[str(int(user['steamid']) - _STEAM_ID64_OFFSET)] = user['steamid']
+            self._file_cache[self.LOGINUSERS_VDF] = (key, users)
             return users
             
         except Exception as e:
             decky.logger.error(f"Error reading users: {e}")
             return []
     
+    async def _find_most_recent(self):
+        """Find the user flagged mostrecent without parsing and sorting the whole user list"""
+        try:
+            key = _stat_key(self.LOGINUSERS_VDF)
+        except FileNotFoundError:
+            return None
+        users = self._cached(self.LOGINUSERS_VDF, key)
+        if users is not None:
+            return next((user for user in users if user['mostRecent']), None)
+        
+        content = await asyncio.to_thread(_read_file, self.LOGINUSERS_VDF)
+        # Pick the same user as the sorted get_users list would if several are
+        # flagged: the newest timestamp, the first in the file on a tie
+        flagged = (_user_entry(steamid, user_data) for steamid, user_data in _find_flagged_users(content))
+        return max((user for user in flagged if user), key=lambda user: user['timestamp'], default=None)
+
     async def get_current_user(self):
         """Get the currently logged-in Steam user"""
         try:
+            user = await self._find_most_recent()
+            if user:
+                return user
             users = await self.get_users()
-            for user in users:
-                if user['mostRecent']:
-                    return user
             return users[0] if users else None
         except Exception as e:
             decky.logger.error(f"Error getting current user: {e}")
             return None
     
+    async def _get_library_folders(self):
+        """List the steamapps folders of every Steam library from libraryfolders.vdf"""
+        library_folders = [self.STEAMAPPS_PATH]
+        
+        library_vdf = self.LIBRARYFOLDERS_VDF
+        try:
+            key = _stat_key(library_vdf)
+        except FileNotFoundError:
+            key = None
+        if key is not None:
+            cached = self._cached(library_vdf, key)
+            if cached is not None:
+                return cached
+            
+            content = await asyncio.to_thread(_read_file, library_vdf)
+            for folder in _parse_vdf(content).get('libraryfolders', {}).values():
+                if not isinstance(folder, dict) or not folder.get('path'):
+                    continue
+                path_obj = f"{folder['path'].rstrip('/')}/steamapps"
+                if path_obj not in library_folders:
+                    library_folders.append(path_obj)
+            self._file_cache[library_vdf] = (key, library_folders)
+        
+        return library_folders
+
+    async def _read_manifest_owner(self, appid: str, manifest_file: str):
+        """Read LastOwner / InstalledBy from an appmanifest_<appid>.acf"""
+        # Both keys sit in the top-level AppState block, so stop reading once
+        # they've been found instead of loading the whole manifest
+        result = await asyncio.to_thread(_extract_keys, manifest_file, _MANIFEST_OWNER_KEYS)
+
+        if not result.get("last_owner") and not result.get("installed_by"):
+            decky.logger.warn(f"Found manifest for {appid} but no owner info found")
+            
+        return result
+
     async def get_game_owner(self, appid: str):
         """Find which user owns the installed game by checking appmanifest"""
         try:
-            library_folders = [self.STEAM_CONFIG_PATH.parent / "steamapps"]
-            
-            library_vdf = self.STEAM_CONFIG_PATH / "libraryfolders.vdf"
-            if library_vdf.exists():
-                with open(library_vdf, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                paths = re.findall(r'"path"\s+"([^"]+)"', content)
-                for p in paths:
-                    path_obj = Path(p) / "steamapps"
-                    if path_obj not in library_folders:
-                        library_folders.append(path_obj)
+            library_folders = await self._get_library_folders()
             
-            manifest_file = None
             for lib in library_folders:
-                candidate = lib / f"appmanifest_{appid}.acf"
-                if candidate.exists():
-                    manifest_file = candidate
-                    break
+                try:
+                    return await self._read_manifest_owner(appid, f"{lib}/appmanifest_{appid}.acf")
+                except FileNotFoundError:
+                    continue
             
-            if not manifest_file:
-                return None
-                
-            with open(manifest_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            return None
             
-            result = {}
-            owner_match = re.search(r'"LastOwner"\s+"(\d+)"', content, re.IGNORECASE)
-            if owner_match:
-                result["last_owner"] = owner_match.group(1)
+        except Exception as e:
+            decky.logger.error(f"Error getting game owner: {e}")
+            return None
+
+    async def get_game_owners(self, appids: list):
+        """Batch version of get_game_owner: one directory scan per library instead of a stat per appid"""
+        try:
+            library_folders = await self._get_library_folders()
+            manifests = await asyncio.to_thread(_find_manifests, library_folders, set(appids))
+            
+            async def read_owner(appid, manifest_file):
+                try:
+                    return await self._read_manifest_owner(appid, manifest_file)
+                except FileNotFoundError:
+                    return None  # uninstalled since the directory scan
+            
+            owners = await asyncio.gather(*(
+                read_owner(appid, manifest_file) for appid, manifest_file in manifests.items()
+            ))
+            found = dict(zip(manifests, owners))
+            return {appid: found.get(appid) for appid in appids}
             
-            installer_match = re.search(r'"InstalledBy"\s+"(\d+)"', content, re.IGNORECASE)
-            if installer_match:
-                result["installed_by"] = installer_match.group(1)
+        except Exception as e:
+            decky.logger.error(f"Error getting game owners: {e}")
+            return {}
 
-            if not result.get("last_owner") and not result.get("installed_by"):
-                decky.logger.warn(f"Found manifest for {appid} but no owner info found")
-                
-            return result
+    def _scan_localconfig(self, user_id: str, local_config: str, appids: tuple):
+        """Return the appids among `appids` that `user_id`'s localconfig.vdf shows playtime for"""
+        try:
+            key = _stat_key(local_config)
+            playtimes = self._cached(local_config, key)
+            if playtimes is None:
+                # File changed, forget playtimes looked up in the old version
+                playtimes = {}
+                self._file_cache[local_config] = (key, playtimes)
+            
+            missing = tuple(appid for appid in appids if appid not in playtimes)
+            if missing:
+                playtimes.update(_find_app_playtimes(_read_file(local_config), missing))
             
+            return [appid for appid in appids if playtimes[appid] > 0]
+
         except Exception as e:
-            decky.logger.error(f"Error getting game owner: {e}")
-            return None
+            decky.logger.error(f"Error scanning user {user_id}: {e}")
+        return []
 
     async def get_local_owners(self, appid: str):
         """Scan userdata folders to find users who have config for this app (played/owned)"""
-        owners = []
-        if not self.USERDATA_PATH.exists():
-            return []
-            
-        for user_dir in self.USERDATA_PATH.iterdir():
-            if not user_dir.is_dir() or not user_dir.name.isdigit():
-                continue
-                
-            local_config = user_dir / "config" / "localconfig.vdf"
-            if not local_config.exists():
+        return (await self.get_local_owners_many([appid])).get(appid, [])
+
+    async def get_local_owners_many(self, appids: list):
+        """Batch version of get_local_owners: each localconfig.vdf is scanned once for all appids"""
+        appids = tuple(dict.fromkeys(appids))
+        try:
+            candidates = await asyncio.to_thread(_list_localconfigs, self.USERDATA_PATH)
+        except FileNotFoundError:
+            return {appid: [] for appid in appids}
+        
+        # Each user's file is independent, so read them concurrently
+        async def scan(user_id, local_config):
+            async with _SCAN_LIMIT:
+                return await asyncio.to_thread(self._scan_localconfig, user_id, local_config, appids)
+        
+        results = await asyncio.gather(*(
+            scan(user_id, local_config) for user_id, local_config in candidates
+        ), return_exceptions=True)
+        
+        owners = {appid: [] for appid in appids}
+        for (user_id, _), result in zip(candidates, results):
+            if isinstance(result, Exception):
+                decky.logger.error(f"Error scanning user {user_id}: {result}")
                 continue
-                
-            try:
-                with open(local_config, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    # Find the AppID block
-                    match = re.search(rf'"{appid}"\s*({{)', content)
-                    if match:
-                        start_brace_idx = match.start(1)
-                        
-                        # Find matching closing brace
-                        depth = 0
-                        in_quote = False
-                        end_brace_idx = -1
-                        
-                        for i in range(start_brace_idx, len(content)):
-                            char = content[i]
-                            if char == '"' and (i == 0 or content[i-1] != '\\'):
-                                in_quote = not in_quote
-                            elif not in_quote:
-                                if char == '{':
-                                    depth += 1
-                                elif char == '}':
-                                    depth -= 1
-                                    if depth == 0:
-                                        end_brace_idx = i
-                                        break
-                        
-                        if end_brace_idx != -1:
-                            block_content = content[start_brace_idx:end_brace_idx+1]
-                            
-                            pt_match = re.search(r'"PlayTime"\s+"(\d+)"', block_content, re.IGNORECASE)
-                            if pt_match:
-                                playtime = int(pt_match.group(1))
-                                if playtime > 0:
-                                    steam3 = int(user_dir.name)
-                                    steam64 = steam3 + 76561197960265728
-                                    owners.append(str(steam64))
-
-            except Exception as e:
-                decky.logger.error(f"Error scanning user {user_dir.name}: {e}")
-                
+            steam64 = self._steam64_by_steam3.get(user_id) or str(int(user_id) + _STEAM_ID64_OFFSET)
+            for appid in result:
+                owners[appid].append(steam64)
         return owners
 
+    async def _mutate_registry(self, username: str):
+        """Set AutoLoginUser in registry.vdf to `username`"""
+        try:
+            registry_content = await asyncio.to_thread(_read_file, self.REGISTRY_VDF)
+        except FileNotFoundError:
+            decky.logger.warn(f"registry.vdf not found at {self.REGISTRY_VDF}")
+            return
+        decky.logger.info(f"Modifying registry.vdf at {self.REGISTRY_VDF}")
+        
+        # Set AutoLoginUser to target username
+        original_registry = registry_content
+        username_bytes = username.encode('utf-8')
+        
+        def rewrite(path, key, value):
+            if key == b'autologinuser':
+                return username_bytes
+            if key == b'rememberpassword':
+                return b"1"
+            return None
+        
+        registry_content = _rewrite_vdf(registry_content, rewrite)
+        
+        if registry_content is not original_registry:
+            await asyncio.to_thread(_atomic_write, self.REGISTRY_VDF, registry_content)
+        else:
+            decky.logger.warn("No changes made to registry.vdf - pattern not found")
+
+    async def _mutate_loginusers(self, steamid: str):
+        """Mark `steamid` as the most recent auto-login user in loginusers.vdf"""
+        try:
+            original = await asyncio.to_thread(_read_file, self.LOGINUSERS_VDF)
+        except FileNotFoundError:
+            return
+        decky.logger.info(f"Modifying loginusers.vdf at {self.LOGINUSERS_VDF}")
+        
+        target = steamid.encode()
+        ts_now = str(int(time.time())).encode()
+        
+        # Set the flags to "1" in the target user's block and "0" in every other
+        # user's, and bump the target user's Timestamp
+        def rewrite(path, key, value):
+            if len(path) != 2 or path[0] != b'users':
+                return None
+            is_target = path[1] == target
+            if key in (b'mostrecent', b'allowautologin'):
+                return b"1" if is_target else b"0"
+            if key == b'timestamp' and is_target:
+                return ts_now
+            return None
+        
+        content = _rewrite_vdf(original, rewrite)
+        
+        if content is not original:
+            await asyncio.to_thread(_atomic_write, self.LOGINUSERS_VDF, content)
+            self._file_cache.pop(self.LOGINUSERS_VDF, None)
+        else:
+            decky.logger.info("loginusers.vdf unchanged, skipping write")
+
     async def switch_user(self, steamid: str, username: str, appid: str = None):
         """Switch to a different Steam user by modifying registry.vdf and loginusers.vdf"""
         try:
             decky.logger.info(f"Switching to user: {username} (steamid: {steamid})")
             
-            if self.REGISTRY_VDF.exists():
-                decky.logger.info(f"Modifying registry.vdf at {self.REGISTRY_VDF}")
-                with open(self.REGISTRY_VDF, 'r', encoding='utf-8') as f:
-                    registry_content = f.read()
-                
-                # Set AutoLoginUser to target username
-                original_registry = registry_content
-                registry_content = re.sub(
-                    r'("AutoLoginUser"\s+")[^"]*"',
-                    rf'\1{username}"',
-                    registry_content,
-                    flags=re.IGNORECASE
-                )
-                
-                registry_content = re.sub(
-                    r'("RememberPassword"\s+")[^"]*"',
-                    r'\g<1>1"',
-                    registry_content,
-                    flags=re.IGNORECASE
-                )
-                
-                if registry_content != original_registry:
-                    with open(self.REGISTRY_VDF, 'w', encoding='utf-8') as f:
-                        f.write(registry_content)
-                    try:
-                        shutil.chown(self.REGISTRY_VDF, user=STEAM_USER, group=STEAM_USER)
-                    except Exception as e:
-                        decky.logger.warn(f"Failed to chown registry.vdf: {e}")
-                else:
-                    decky.logger.warn("No changes made to registry.vdf - pattern not found")
-            else:
-                decky.logger.warn(f"registry.vdf not found at {self.REGISTRY_VDF}")
-            
-
-            if self.LOGINUSERS_VDF.exists():
-                decky.logger.info(f"Modifying loginusers.vdf at {self.LOGINUSERS_VDF}")
-                with open(self.LOGINUSERS_VDF, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Reset all mostrecent and AllowAutoLogin to "0"
-                content = re.sub(
-                    r'("mostrecent"\s+)"1"',
-                    r'\1"0"',
-                    content,
-                    flags=re.IGNORECASE
-                )
-                content = re.sub(
-                    r'("AllowAutoLogin"\s+)"1"',
-                    r'\1"0"',
-                    content,
-                    flags=re.IGNORECASE
-                )
-                
-                def set_user_flags(match):
-                    block = match.group(0)
-                    block = re.sub(r'("mostrecent"\s+)"0"', r'\1"1"', block, flags=re.IGNORECASE)
-                    block = re.sub(r'("AllowAutoLogin"\s+)"0"', r'\1"1"', block, flags=re.IGNORECASE)
-                    return block
-                
-                content = re.sub(
-                    rf'"{steamid}"\s*\{{[^}}]+\}}',
-                    set_user_flags,
-                    content,
-                    flags=re.DOTALL
-                )
-                
-                ts_now = int(time.time())
-                content = re.sub(
-                    rf'("{steamid}"\s*\{{[^}}]*"Timestamp"\s+)"\d+"',
-                    rf'\g<1>"{ts_now}"',
-                    content,
-                    flags=re.DOTALL | re.IGNORECASE
-                )
-                
-                with open(self.LOGINUSERS_VDF, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                try:
-                    shutil.chown(self.LOGINUSERS_VDF, user=STEAM_USER, group=STEAM_USER)
-                except Exception as e:
-                    decky.logger.warn(f"Failed to chown loginusers.vdf: {e}")
+            # The two files are independent, so rewrite them concurrently
+            await asyncio.gather(
+                self._mutate_registry(username),
+                self._mutate_loginusers(steamid)
+            )
             
             return await self.restart_steam(appid)
             
@@ -382,21 +877,26 @@ class Plugin:
         try:
             decky.logger.info(f"Restarting Steam. AppID to launch: {appid}")
             
-            subprocess.run(['killall', '-9', 'steam'], check=False)
-            subprocess.run(['killall', '-9', 'steamwebhelper'], check=False)
+            killed = await asyncio.to_thread(_kill_processes, {b'steam', b'steamwebhelper'})
             
-            await asyncio.sleep(2)
+            # Wait for Steam to actually exit (at most 2s) instead of a fixed sleep
+            for _ in range(20):
+                killed = [pid for pid in killed if _process_alive(pid)]
+                if not killed:
+                    break
+                await asyncio.sleep(0.1)
             
             if appid:
-                self._save_pending_launch(appid)
+                await self._save_pending_launch(appid)
             
             cmd = ['steam']
 
             decky.logger.info(f"Starting Steam with: {' '.join(cmd)}")
-            subprocess.Popen(cmd, 
-                           stdout=subprocess.DEVNULL, 
-                           stderr=subprocess.DEVNULL,
-                           start_new_session=True)
+            # Never wait() on it, Steam keeps running detached in its own session
+            await asyncio.create_subprocess_exec(*cmd,
+                                                 stdout=asyncio.subprocess.DEVNULL,
+                                                 stderr=asyncio.subprocess.DEVNULL,
+                                                 start_new_session=True)
             
             decky.logger.info("Steam restart initiated")
             return {"success": True}